@@ -0,0 +1,55 @@
+# Benchmarks the memory footprint per entity, with and without interning
+#
+# Usage
+#
+#     PYTHONPATH=. python benchmarks/bench__memory.py
+
+from fame import array
+from fame import nullable
+from fame import options
+from fame import regexp
+from fame import schema
+from fame import Model
+from fame.memory import measure
+
+
+class Plain(Model):
+
+    @schema
+    def metamodel(self, m):
+        m.field('name', str)
+        m.field('subject', options('user', 'visitor', 'email', 'listing', 'market'))
+        m.field('treatments', array(str))
+        m.field('design', nullable(regexp("^https?://")))
+
+
+class Interned(Model):
+
+    @schema
+    def metamodel(self, m):
+        m.intern_values(share_arrays=True)
+        m.field('name', str)
+        m.field('subject', options('user', 'visitor', 'email', 'listing', 'market'))
+        m.field('treatments', array(str))
+        m.field('design', nullable(regexp("^https?://")))
+
+
+def records(count):
+    # Builds fresh copies of repeated strings, as parsing records would
+    for n in xrange(count):
+        yield dict(
+            name='experiment_{}'.format(n),
+            subject=''.join(['u', 's', 'e', 'r']),
+            treatments=['control'.upper().lower(), 'treatment'.upper().lower()],
+            design='http://example.com/{}'.format(n % 10),
+        )
+
+
+def main(count=10000):
+    for model in [Plain, Interned]:
+        entities = [model(**each) for each in records(count)]
+        print measure(entities, count_shared=False)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+# Benchmarks finalizing hundreds of models with warm_up, and compares that
+# with unpickling their finalized fields, which is why there is no snapshot
+#
+# Usage
+#
+#     PYTHONPATH=. python benchmarks/bench__startup.py
+
+import cPickle
+import time
+
+from fame import array
+from fame import constraint
+from fame import nullable
+from fame import options
+from fame import regexp
+from fame import schema
+from fame import Model
+from fame.startup import warm_up
+
+
+def define_models(count):
+    models = []
+    for n in xrange(count):
+
+        class Example(Model):
+
+            @schema
+            def metamodel(self, m):
+                m.field('name', str)
+                m.field('subject', options('user', 'visitor', 'email', 'listing', 'market'))
+                m.field('treatments', array(str))
+                m.field('percent_exposed', int, default=100)
+                m.field('design', nullable(regexp("^https?://")))
+
+            @constraint("expected percent_exposed to not exceed 100, got {}")
+            def constraint(self):
+                if self.percent_exposed > 100:
+                    return self.percent_exposed
+
+        Example.__name__ = 'Example{}'.format(n)
+        models.append(Example)
+    return models
+
+
+def timed(function):
+    start = time.time()
+    function()
+    return time.time() - start
+
+
+def main(count=500):
+    models = define_models(count)
+    print "warm_up  {:8.2f} ms".format(timed(lambda: warm_up(models)) * 1e3)
+
+    data = cPickle.dumps([each.metamodel.fields for each in models], cPickle.HIGHEST_PROTOCOL)
+    print "unpickle {:8.2f} ms".format(timed(lambda: cPickle.loads(data)) * 1e3)
+
+
+if __name__ == '__main__':
+    main()
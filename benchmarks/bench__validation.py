@@ -0,0 +1,56 @@
+# Benchmarks the validation modes of Metamodel.validate
+#
+# Usage
+#
+#     PYTHONPATH=. python benchmarks/bench__validation.py
+
+import timeit
+
+from fame import array
+from fame import constraint
+from fame import nullable
+from fame import options
+from fame import regexp
+from fame import schema
+from fame import Model
+
+
+class Example(Model):
+
+    @schema
+    def metamodel(self, m):
+        m.field('name', str)
+        m.field('subject', options('user', 'visitor', 'email', 'listing', 'market'))
+        m.field('treatments', array(str))
+        m.field('percent_exposed', int, default=100)
+        m.field('design', nullable(regexp("^https?://")))
+
+    @constraint("expected percent_exposed to not exceed 100, got {}")
+    def constraint(self):
+        if self.percent_exposed > 100:
+            return self.percent_exposed
+
+
+VALID = Example(name='button_color', subject='user', treatments=['control', 'treatment'])
+INVALID = Example(name='button_color', percent_exposed=200, design=False)
+
+CASES = [
+    ('error_messages', lambda e: list(e.error_messages())),
+    ('valid', lambda e: e.validate('valid')),
+    ('count', lambda e: e.validate('count')),
+    ('messages', lambda e: e.validate('messages')),
+    ('messages, limit=1', lambda e: e.validate('messages', limit=1)),
+    ('failures', lambda e: e.validate('failures')),
+    ('fields=[design]', lambda e: e.validate('count', fields=['design'], constraints=[])),
+]
+
+
+def main(number=20000):
+    for label, entity in [('valid', VALID), ('invalid', INVALID)]:
+        for name, function in CASES:
+            seconds = timeit.timeit(lambda: function(entity), number=number)
+            print "{:8} {:20} {:8.2f} us".format(label, name, seconds / number * 1e6)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+import random
+
+
+# Aggregates validation failures of many entities into a histogram.
+#
+# - Failures are counted per field name and per constraint message
+# - Each field and constraint keeps a bounded reservoir of sample failures
+# - Memory is bounded by the size of the schema, not by the number of entities
+# - Aggregates of parallel workers can be pickled and merged
+#
+# Example
+#
+#     aggregate = ErrorAggregate(Example, sample_size=3)
+#     aggregate.consume(entities)
+#     for kind, key, stats in aggregate.most_common(10):
+#         print kind, key, stats.count, stats.samples
+
+
+class RuleStatistics(object):
+
+    # Counts the failures of a single field or constraint and keeps a uniform
+    # sample of (entity name, value) pairs using reservoir sampling.
+
+    def __init__(self, sample_size):
+        self.sample_size = sample_size
+        self.count = 0
+        self.samples = []
+
+    def add(self, entity_name, value, rand):
+        self.count += 1
+        if len(self.samples) < self.sample_size:
+            self.samples.append((entity_name, value))
+        else:
+            index = rand.randrange(self.count)
+            if index < self.sample_size: self.samples[index] = (entity_name, value)
+
+    def merge(self, other, rand):
+        # Draws each slot from either reservoir with probability proportional
+        # to the number of failures it still stands for, such that the merged
+        # reservoir remains a uniform sample of the combined failures.
+        mine, theirs = list(self.samples), list(other.samples)
+        remaining = [self.count, other.count]
+        samples = []
+        while len(samples) < self.sample_size and (mine or theirs):
+            if not theirs or (mine and rand.randrange(sum(remaining)) < remaining[0]):
+                samples.append(mine.pop(rand.randrange(len(mine))))
+                remaining[0] -= 1
+            else:
+                samples.append(theirs.pop(rand.randrange(len(theirs))))
+                remaining[1] -= 1
+        self.count += other.count
+        self.samples = samples
+
+    def __repr__(self):
+        return "<RuleStatistics count={}>".format(self.count)
+
+
+class ErrorAggregate(object):
+
+    def __init__(self, model, sample_size=5, seed=None):
+        self.name = model.metamodel.name
+        self.sample_size = sample_size
+        self.random = random.Random(seed)
+        self.entities = 0
+        self.invalid_entities = 0
+        self.fields = {}
+        self.constraints = {}
+
+    def statistics_for(self, rule):
+        table = self.fields if rule.kind == 'field' else self.constraints
+        if rule.key not in table: table[rule.key] = RuleStatistics(self.sample_size)
+        return table[rule.key]
+
+    def add(self, entity, fields=None, constraints=None):
+        metamodel = entity.metamodel
+        count = 0
+        for rule, value in metamodel.failures(entity, fields, constraints):
+            entity_name = metamodel.get_field_value(entity, 'name', strict=False)
+            self.statistics_for(rule).add(entity_name, value, self.random)
+            count += 1
+        self.entities += 1
+        if count: self.invalid_entities += 1
+        return count
+
+    def consume(self, entities, fields=None, constraints=None):
+        for entity in entities: self.add(entity, fields, constraints)
+        return self
+
+    def merge(self, other):
+        if other.name != self.name:
+            raise ValueError, "expected aggregate of {}, got {}".format(self.name, other.name)
+        for mine, theirs in [(self.fields, other.fields), (self.constraints, other.constraints)]:
+            for key, stats in theirs.items():
+                if key not in mine: mine[key] = RuleStatistics(self.sample_size)
+                mine[key].merge(stats, self.random)
+        self.entities += other.entities
+        self.invalid_entities += other.invalid_entities
+        return self
+
+    def most_common(self, n=None):
+        rows = [('field', key, each) for key, each in self.fields.items()]
+        rows += [('constraint', key, each) for key, each in self.constraints.items()]
+        rows.sort(key=lambda row: row[2].count, reverse=True)
+        return rows if n is None else rows[:n]
+
+    def __repr__(self):
+        return "<ErrorAggregate name={} entities={} invalid={}>".format(
+            self.name, self.entities, self.invalid_entities)
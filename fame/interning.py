@@ -0,0 +1,116 @@
+from matchers import ArrayMatcher
+from matchers import NullableMatcher
+from matchers import OptionsMatcher
+from matchers import RegularExpressionMatcher
+from matchers import SharedArray
+from matchers import TypeMatcher
+
+
+# Interns repeated field values such that entities share one copy of each.
+#
+# Interning is opt-in per model and driven by the schema,
+#
+#     @schema
+#     def metamodel(self, m):
+#         m.intern_values(share_arrays=True)
+#         m.field('subject', options('user', 'visitor'))
+#         m.field('treatments', array(str))
+#
+# - Values of options, regexp and array(str) fields are interned
+# - Arrays are optionally interned as a whole and shared as SharedArray
+# - Values are interned when constructing an entity
+# - The intern table is bounded, values beyond its size are not interned
+# - The intern table is seeded with all options, so options match on identity
+# - Regexp matchers cache their results, see matchers.py
+#
+# The same intern table can be shared by several models.
+
+
+class InternTable(object):
+
+    # Values are keyed by type and value, since in python 2 equal str and
+    # unicode values hash the same, and interning must not change the type of
+    # a value. Arrays are keyed by the types of their elements as well.
+
+    def __init__(self, max_size=100000):
+        self.max_size = max_size
+        self.table = {}
+        self.hits = 0
+        self.misses = 0
+        self.rejected = 0
+
+    def intern(self, value, key=None):
+        if key is None: key = type(value), value
+        interned = self.table.get(key)
+        if interned is not None:
+            self.hits += 1
+            return interned
+        if len(self.table) >= self.max_size:
+            self.rejected += 1
+            return value
+        self.misses += 1
+        self.table[key] = value
+        return value
+
+    def intern_array(self, values):
+        shared = SharedArray(values)
+        return self.intern(shared, (SharedArray, tuple(type(each) for each in values), shared))
+
+    def seed(self, values):
+        for each in values:
+            if len(self.table) < self.max_size: self.table.setdefault((type(each), each), each)
+
+    def stats(self):
+        return dict(
+            size=len(self.table),
+            max_size=self.max_size,
+            hits=self.hits,
+            misses=self.misses,
+            rejected=self.rejected,
+        )
+
+    def __len__(self):
+        return len(self.table)
+
+    def __repr__(self):
+        return "<InternTable size={} hits={} misses={} rejected={}>".format(
+            len(self.table), self.hits, self.misses, self.rejected)
+
+
+def is_string_matcher(match):
+    return isinstance(match, TypeMatcher) and match.type is basestring
+
+
+class Interning(object):
+
+    def __init__(self, table, share_arrays):
+        self.table = table
+        self.share_arrays = share_arrays
+        self.value_fields = []
+        self.array_fields = []
+
+    def bind(self, fields):
+        for field in fields:
+            match = field.match
+            if isinstance(match, NullableMatcher): match = match.match
+            if isinstance(match, OptionsMatcher):
+                self.table.seed(each for each in match.options if isinstance(each, basestring))
+                self.value_fields.append(field.name)
+            if isinstance(match, RegularExpressionMatcher):
+                match.enable_cache()
+                self.value_fields.append(field.name)
+            if isinstance(match, ArrayMatcher) and is_string_matcher(match.match):
+                self.array_fields.append(field.name)
+
+    def intern_data(self, data):
+        intern = self.table.intern
+        for name in self.value_fields:
+            value = data.get(name)
+            if isinstance(value, basestring): data[name] = intern(value)
+        for name in self.array_fields:
+            values = data.get(name)
+            if not isinstance(values, list): continue
+            values = [intern(each) if isinstance(each, basestring) else each for each in values]
+            if self.share_arrays and all(isinstance(each, basestring) for each in values):
+                values = self.table.intern_array(values)
+            data[name] = values
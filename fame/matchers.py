@@ -19,13 +19,19 @@ class TypeMatcher(object):
         return self.type.__name__
 
 
+class SharedArray(tuple):
+
+    # An immutable array that is shared by many entities, see interning.py
+    pass
+
+
 class ArrayMatcher(object):
 
     def __init__(self, type_declaration):
         self.match = as_matcher(type_declaration)
 
     def __call__(self, values):
-        if not isinstance(values, list): return False
+        if not isinstance(values, (list, SharedArray)): return False
         return all(self.match(each) for each in values)
 
     def __str__(self):
@@ -58,12 +64,29 @@ class OptionsMatcher(object):
 
 class RegularExpressionMatcher(object):
 
+    # Results can be cached per value, which is turned on for models that
+    # intern values, see interning.py. Interned strings have their hash cached
+    # and compare on identity, so cache lookups are cheap. The cache is cleared
+    # when it exceeds cache_size values.
+
+    cache_size = 1000
+
     def __init__(self, pattern):
         self.regexp = re.compile(pattern)
+        self.cache = None
 
     def __call__(self, value):
         if not isinstance(value, basestring): return False
-        return self.regexp.search(value)
+        if self.cache is None: return self.regexp.search(value)
+        result = self.cache.get(value)
+        if result is not None: return result
+        result = self.regexp.search(value) is not None
+        if len(self.cache) >= self.cache_size: self.cache.clear()
+        self.cache[value] = result
+        return result
+
+    def enable_cache(self):
+        if self.cache is None: self.cache = {}
 
     def __str__(self):
         return "regexp({})".format(self.regexp.pattern)
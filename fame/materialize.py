@@ -0,0 +1,157 @@
+import dis
+import traceback
+from multiprocessing.pool import Pool
+from multiprocessing.pool import ThreadPool
+
+
+# Precomputes derived fields across a collection of entities of one model.
+#
+# - Dependencies between derived fields are found in their bytecode, that is
+#   any derived field read as attribute of self, eg self.is_miscellanous
+# - Derived fields are computed in dependency order, per entity
+# - Entities are processed in parallel on a thread pool, or a process pool
+# - Values are written back to the memoized storage of each entity
+# - Failures are reported per entity, and do not abort the batch
+# - Derived fields whose dependencies failed are reported as missing
+#
+# Process pools send each entity's data to a worker, which requires model
+# classes, data and derived values to be picklable. Errors raised in a worker
+# are reported as MaterializationError, since not every exception can be
+# unpickled, and a result that cannot be unpickled hangs the pool.
+#
+# Example
+#
+#     report = materialize(entities, ['is_miscellanous', 'title'], workers=8)
+#     for index, errors in report.failures.items():
+#         print entities[index].name, errors
+
+
+class MissingDependency(Exception):
+    pass
+
+
+class MaterializationError(Exception):
+
+    def __init__(self, type_name, message, formatted_traceback):
+        Exception.__init__(self, type_name, message, formatted_traceback)
+        self.type_name = type_name
+        self.message = message
+        self.traceback = formatted_traceback
+
+    def __str__(self):
+        return "{}: {}".format(self.type_name, self.message)
+
+
+def self_attributes(code):
+    # Yields names of LOAD_ATTR instructions that follow LOAD_FAST 0, which is
+    # self. Reads in nested functions, eg lambdas, or through getattr are not
+    # found, such derived fields are still computed but lazily.
+    bytecode = [ord(each) for each in code.co_code]
+    previous = None
+    n = 0
+    while n < len(bytecode):
+        opcode, argument = bytecode[n], None
+        if opcode >= dis.HAVE_ARGUMENT:
+            argument = bytecode[n + 1] + bytecode[n + 2] * 256
+            n += 3
+        else:
+            n += 1
+        if opcode == dis.opmap['LOAD_ATTR'] and previous == (dis.opmap['LOAD_FAST'], 0):
+            yield code.co_names[argument]
+        previous = opcode, argument
+
+
+def dependencies(metamodel, name):
+    code = metamodel.derived_fields[name].initializer.__code__
+    names = set(self_attributes(code))
+    return [each for each in sorted(names) if each in metamodel.derived_fields and each != name]
+
+
+def dependency_order(metamodel, names):
+    for each in names:
+        if each not in metamodel.derived_fields:
+            raise ValueError, "expected derived field of {}, got {}".format(metamodel.name, each)
+    order, visiting = [], set()
+    def visit(name):
+        if name in order: return
+        if name in visiting: raise ValueError, "expected no cyclic derived fields, got {}".format(name)
+        visiting.add(name)
+        for each in dependencies(metamodel, name): visit(each)
+        visiting.remove(name)
+        order.append(name)
+    for each in names: visit(each)
+    return order
+
+
+def compute(entity, order, graph, wrap_errors=False):
+    # Computes the derived fields in order, where graph maps each derived field
+    # to its dependencies, which are found once per batch rather than per entity
+    metamodel = type(entity).metamodel
+    values, errors = {}, {}
+    for name in order:
+        missing = [each for each in graph[name] if each in errors]
+        if missing:
+            errors[name] = MissingDependency("{} requires {}".format(name, ', '.join(missing)))
+            continue
+        try:
+            values[name] = metamodel.derived_fields[name].get_value(entity)
+        except Exception as error:
+            if wrap_errors: error = MaterializationError(type(error).__name__, str(error), traceback.format_exc())
+            errors[name] = error
+    return values, errors
+
+
+def compute_in_thread(task):
+    entity, order, graph = task
+    return compute(entity, order, graph)
+
+
+def compute_in_process(task):
+    model, data, order, graph = task
+    return compute(model(**data), order, graph, wrap_errors=True)
+
+
+class MaterializationReport(object):
+
+    def __init__(self):
+        self.entities = 0
+        self.computed = 0
+        self.failures = {}
+
+    def add(self, index, values, errors):
+        self.entities += 1
+        self.computed += len(values)
+        if errors: self.failures[index] = errors
+
+    def __repr__(self):
+        return "<MaterializationReport entities={} computed={} failures={}>".format(
+            self.entities, self.computed, len(self.failures))
+
+
+def materialize(entities, names, workers=4, processes=False, pool=None, chunksize=64):
+    entities = list(entities)
+    report = MaterializationReport()
+    if not entities: return report
+    metamodel = type(entities[0]).metamodel
+    order = dependency_order(metamodel, names)
+    graph = {name: dependencies(metamodel, name) for name in order}
+    if processes:
+        tasks = [(type(each), each.data, order, graph) for each in entities]
+        function = compute_in_process
+    else:
+        tasks = [(each, order, graph) for each in entities]
+        function = compute_in_thread
+    own_pool = pool is None
+    if own_pool: pool = Pool(workers) if processes else ThreadPool(workers)
+    try:
+        results = pool.map(function, tasks, chunksize)
+    finally:
+        if own_pool:
+            pool.close()
+            pool.join()
+    for index, (entity, (values, errors)) in enumerate(zip(entities, results)):
+        for name, value in values.items():
+            entity.data[name] = value
+            setattr(entity, name, value) # memoize this attribute
+        report.add(index, values, errors)
+    return report
@@ -0,0 +1,129 @@
+import gc
+import random
+import sys
+
+from model import Model
+
+
+# Accounts for the memory footprint of entities, per model class.
+#
+# The bytes of each entity are broken down into,
+#
+# - fields = values of declared fields
+# - derived = values of derived fields, which are memoized in data
+# - custom = values of custom fields, and of other instance attributes
+# - overhead = the entity itself, and its __dict__ and data dicts
+#
+# Attributes memoized by Model.__getattr__ and DerivedField.__get__ refer to
+# the same values as data, and thus only add to the size of __dict__. Keys are
+# not counted since field names are shared with the schema.
+#
+# Values are sized deeply, counting each object once per entity. Given
+# count_shared=False, each object is counted once across all entities instead,
+# such that values shared through interning are not counted over and over.
+#
+# Example
+#
+#     report = measure(live_entities(Example), sample_size=1000)
+#     print report
+
+
+CATEGORIES = ('fields', 'derived', 'custom', 'overhead')
+
+
+def sizeof(value, seen):
+    if id(value) in seen: return 0
+    seen.add(id(value))
+    size = sys.getsizeof(value)
+    if isinstance(value, (list, tuple, set, frozenset)):
+        size += sum(sizeof(each, seen) for each in value)
+    elif isinstance(value, dict):
+        size += sum(sizeof(each, seen) for each in value.values())
+    return size
+
+
+def live_entities(model=Model):
+    return (each for each in gc.get_objects() if isinstance(each, model))
+
+
+def sample(entities, sample_size, rand):
+    samples = []
+    for n, entity in enumerate(entities):
+        if n < sample_size: samples.append(entity)
+        else:
+            index = rand.randrange(n + 1)
+            if index < sample_size: samples[index] = entity
+    return samples
+
+
+class ModelFootprint(object):
+
+    def __init__(self, name):
+        self.name = name
+        self.entities = 0
+        self.categories = dict.fromkeys(CATEGORIES, 0)
+        self.attributes = {}
+
+    def add(self, category, name, size):
+        self.categories[category] += size
+        if name is not None: self.attributes[name] = self.attributes.get(name, 0) + size
+
+    @property
+    def total(self):
+        return sum(self.categories.values())
+
+    def per_entity(self, category=None):
+        size = self.total if category is None else self.categories[category]
+        return float(size) / self.entities if self.entities else 0.0
+
+    def __repr__(self):
+        return "<ModelFootprint name={} entities={} total={}>".format(self.name, self.entities, self.total)
+
+
+class MemoryReport(object):
+
+    def __init__(self):
+        self.models = {}
+
+    def footprint_of(self, metamodel):
+        if metamodel.name not in self.models: self.models[metamodel.name] = ModelFootprint(metamodel.name)
+        return self.models[metamodel.name]
+
+    def add(self, entity, seen):
+        metamodel = type(entity).metamodel
+        footprint = self.footprint_of(metamodel)
+        footprint.entities += 1
+        attributes = vars(entity)
+        footprint.add('overhead', None, sys.getsizeof(entity) + sys.getsizeof(attributes) + sys.getsizeof(entity.data))
+        for name, value in entity.data.items():
+            footprint.add(self.category_of(metamodel, name), name, sizeof(value, seen))
+        for name, value in attributes.items():
+            if name in ('data', 'metamodel') or name in entity.data: continue
+            footprint.add(self.category_of(metamodel, name), name, sizeof(value, seen))
+
+    def category_of(self, metamodel, name):
+        if name in metamodel.fields: return 'fields'
+        if name in metamodel.derived_fields: return 'derived'
+        return 'custom'
+
+    @property
+    def total(self):
+        return sum(each.total for each in self.models.values())
+
+    def __str__(self):
+        lines = ["{:24} {:>10} {:>12} {:>10} {:>10} {:>10} {:>10} {:>10}".format(
+            'model', 'entities', 'total', 'per entity', *CATEGORIES)]
+        for each in sorted(self.models.values(), key=lambda each: each.total, reverse=True):
+            lines.append("{:24} {:10} {:12} {:10.1f} {:10.1f} {:10.1f} {:10.1f} {:10.1f}".format(
+                each.name, each.entities, each.total, each.per_entity(),
+                *[each.per_entity(category) for category in CATEGORIES]))
+        return '\n'.join(lines)
+
+
+def measure(entities, sample_size=None, count_shared=True, seed=None):
+    if sample_size is not None: entities = sample(entities, sample_size, random.Random(seed))
+    report = MemoryReport()
+    shared = set()
+    for entity in entities:
+        report.add(entity, set() if count_shared else shared)
+    return report
@@ -1,3 +1,7 @@
+from itertools import islice
+
+from interning import Interning
+from interning import InternTable
 from matchers import as_matcher
 
 
@@ -26,6 +30,7 @@ class Metamodel(object):
         assert function.__name__ == 'metamodel'
         self.pending_initialization = function
         self.constraints = []
+        self.interning = None
         most_recent_metamodel = self
 
     def __get__(self, instance, cls):
@@ -43,11 +48,15 @@ class Metamodel(object):
             for name, each in model.__dict__.items()
             if isinstance(each, DerivedField)
         }
+        if self.interning: self.interning.bind(self.fields.values())
         self.pending_initialization = None
 
     def field(self, field_name, field_type, **options):
         self.fields[field_name] = Field(field_name, field_type, **options)
 
+    def intern_values(self, table=None, share_arrays=False):
+        self.interning = Interning(table or InternTable(), share_arrays)
+
     def get_field_value(self, entity, field_name, strict):
         if field_name in self.fields: return self.fields[field_name].get_value(entity)
         if field_name in self.derived_fields: return self.derived_fields[field_name].get_value(entity)
@@ -60,25 +69,88 @@ class Metamodel(object):
         else:
             return "{} at {}".format(self.name, hex(id(entity)))
 
-    def error_messages(self, entity):
-        for field in self.fields.values():
+    def select_fields(self, field_names):
+        if field_names is None: return self.fields.values()
+        for each in field_names:
+            if each not in self.fields:
+                raise ValueError, "expected field of {}, got {}".format(self.name, each)
+        return [self.fields[each] for each in field_names]
+
+    def select_constraints(self, messages):
+        if messages is None: return self.constraints
+        known = set(each.message for each in self.constraints)
+        for each in messages:
+            if each not in known:
+                raise ValueError, "expected constraint of {}, got \"{}\"".format(self.name, each)
+        messages = set(messages)
+        return [each for each in self.constraints if each.message in messages]
+
+    def failures(self, entity, fields=None, constraints=None):
+        # Yields (rule, value) pairs lazily and without formatting any error
+        # message, where rule is either a Field or a Constraint. The fields and
+        # constraints arguments select a subset of field names and constraint
+        # messages, or all of them if None.
+        for field in self.select_fields(fields):
             value = field.get_value(entity)
             if not field.match(value):
-                prefix = self.error_messages_prefix(entity)
-                yield "{} expected field '{}' to be {}, got {}".format(prefix, field.name, field.match, value)
-        for constraint in self.constraints:
-            error_message = constraint.error_message(entity)
-            if error_message:
-                prefix = self.error_messages_prefix(entity)
-                yield "{} {}".format(prefix, error_message)
+                yield field, value
+        for constraint in self.select_constraints(constraints):
+            values = constraint.check(entity)
+            if values is not None:
+                yield constraint, values
+
+    def error_message(self, entity, rule, value):
+        return "{} {}".format(self.error_messages_prefix(entity), rule.error_message_for(value))
+
+    def error_messages(self, entity, fields=None, constraints=None):
+        for rule, value in self.failures(entity, fields, constraints):
+            yield self.error_message(entity, rule, value)
+
+    # Validation modes, each of which does only the work it needs,
+    #
+    # - 'valid' stops at the first failure and returns a boolean
+    # - 'count' counts failures without formatting any error message
+    # - 'messages' returns a list of formatted error messages
+    # - 'failures' returns a list of (rule, value) pairs
+    #
+    # All modes accept a limit, which stops after that many failures, and a
+    # subset of field names and constraint messages to check.
+
+    def validate(self, entity, mode='messages', limit=None, fields=None, constraints=None):
+        failures = self.failures(entity, fields, constraints)
+        if limit is not None: failures = islice(failures, limit)
+        if mode == 'valid': return next(failures, None) is None
+        if mode == 'count': return sum(1 for each in failures)
+        if mode == 'messages': return [self.error_message(entity, rule, value) for rule, value in failures]
+        if mode == 'failures': return list(failures)
+        raise ValueError, "unknown validation mode, got {}".format(mode)
 
     def __repr__(self):
         return "<Metamodel name={}>".format(self.name)
 
+class InterningLookup(object):
+
+    # Looks up the interning of a model class upon the first construction of an
+    # entity, which finishes initialization of its metamodel if pending, and
+    # then memoizes the result as class attribute. Thus constructing entities
+    # of models that do not intern values costs a single attribute lookup.
+    #
+    # The attribute is named _interning such that it does not shadow fields.
+
+    def __get__(self, instance, cls):
+        metamodel = cls.metamodel
+        interning = metamodel.interning if isinstance(metamodel, Metamodel) else None
+        cls._interning = interning # memoize this attribute
+        return interning
+
+
 class Model(object):
 
+    _interning = InterningLookup()
+
     def __init__(self, **data):
         self.data = dict(data)
+        if self._interning: self._interning.intern_data(self.data)
 
     def __getattr__(self, field_name):
         value = self.metamodel.get_field_value(self, field_name, strict=True)
@@ -88,11 +160,14 @@ class Model(object):
     def __getitem__(self, field_name):
         return self.metamodel.get_field_value(self, field_name, strict=False)
 
-    def is_valid(self):
-        return not any(self.error_messages())
+    def is_valid(self, fields=None, constraints=None):
+        return self.metamodel.validate(self, 'valid', fields=fields, constraints=constraints)
 
-    def error_messages(self):
-        return self.metamodel.error_messages(self)
+    def error_messages(self, fields=None, constraints=None):
+        return self.metamodel.error_messages(self, fields, constraints)
+
+    def validate(self, mode='messages', limit=None, fields=None, constraints=None):
+        return self.metamodel.validate(self, mode, limit, fields, constraints)
 
     @property
     def metamodel(self, m):
@@ -105,16 +180,28 @@ class Model(object):
 
 class Field(object):
 
+    kind = 'field'
+
     def __init__(self, name, type_declaration, default=None, **options):
         self.name = name
         self.match = as_matcher(type_declaration)
         self.default = default
         self.options = options
 
+    @property
+    def key(self):
+        return self.name
+
     def get_value(self, entity):
-        value = entity.data.get(self.name)
+        return self.value_in(entity.data)
+
+    def value_in(self, data):
+        value = data.get(self.name)
         return self.default if value is None else value
 
+    def error_message_for(self, value):
+        return "expected field '{}' to be {}, got {}".format(self.name, self.match, value)
+
     def __repr__(self):
         return "<Field name={} type={}>".format(self.name, self.type_matcher)
 
@@ -157,9 +244,15 @@ class Constraint(object):
     # are named after their error message string, as inspired by Rspec examples,
     # rather than forcing people to repeat themselves in the method name.
 
+    kind = 'constraint'
+
     def __init__(self, message):
         self.message = message
 
+    @property
+    def key(self):
+        return self.message
+
     def __call__(self, function):
         assert function.__name__ == 'constraint'
         self.function = function
@@ -169,12 +262,20 @@ class Constraint(object):
         # sure we don't shadow the imported decorator named 'constraint'
         return Constraint
 
-    def error_message(self, entity):
+    def check(self, entity):
         values = self.function(entity)
         if values is None: return
         if not isinstance(values, tuple): values = (values,)
+        return values
+
+    def error_message_for(self, values):
         return self.message.format(*values)
 
+    def error_message(self, entity):
+        values = self.check(entity)
+        if values is None: return
+        return self.error_message_for(values)
+
     def __repr__(self):
         return "<Constraint msg=\"{}\">".format(self.message)
 
@@ -0,0 +1,188 @@
+import math
+import random
+
+from model import Model
+
+
+# Estimates error rates of a large collection of records by validating a
+# random sample only.
+#
+# - Sized collections are visited in random order, iterables in given order
+# - Iterables can be subsampled with a fraction (Bernoulli sampling)
+# - Sampling can be stratified by a field, eg an options field
+# - Error rates are estimated per field and per constraint
+# - Confidence intervals are Wilson score intervals
+# - Sampling stops early once all intervals are within the requested precision
+#
+# Stratified sampling reads the stratum field of each record, which is cheap,
+# but validates at most per_stratum records of each stratum. Error rates are
+# then weighted by the number of records seen per stratum, such that rare
+# strata are not drowned out by frequent ones. Stratified sampling thus reads
+# all records to count them per stratum, even once all strata are full.
+#
+# Example
+#
+#     report = estimate_error_rates(Example, records, precision=0.01, stratify_by='subject')
+#     for name, estimate in report.fields.items():
+#         print name, estimate.rate, estimate.low, estimate.high
+
+
+def z_score(confidence):
+    # Inverts the normal distribution function by bisection
+    low, high = 0.0, 10.0
+    target = 0.5 + confidence / 2.0
+    for each in xrange(60):
+        middle = (low + high) / 2.0
+        if 0.5 * (1.0 + math.erf(middle / math.sqrt(2.0))) < target: low = middle
+        else: high = middle
+    return (low + high) / 2.0
+
+
+def wilson_interval(rate, n, z):
+    if n <= 0: return 0.0, 1.0
+    denominator = 1.0 + z * z / n
+    center = (rate + z * z / (2.0 * n)) / denominator
+    margin = z * math.sqrt(rate * (1.0 - rate) / n + z * z / (4.0 * n * n)) / denominator
+    return max(0.0, center - margin), min(1.0, center + margin)
+
+
+def random_order(records, rand):
+    # Lazy Fisher-Yates shuffle, only remembers indices that have been swapped
+    # into slots not yet visited, and forgets each as its slot is visited
+    size = len(records)
+    swapped = {}
+    for n in xrange(size):
+        m = rand.randrange(n, size)
+        current = swapped.pop(n, n)
+        if m == n:
+            index = current
+        else:
+            index = swapped.get(m, m)
+            swapped[m] = current
+        yield records[index]
+
+
+class Estimate(object):
+
+    def __init__(self, rate, low, high, failures, sampled):
+        self.rate = rate
+        self.low = low
+        self.high = high
+        self.failures = failures
+        self.sampled = sampled
+
+    @property
+    def half_width(self):
+        return (self.high - self.low) / 2.0
+
+    def __repr__(self):
+        return "<Estimate rate={:.4f} low={:.4f} high={:.4f}>".format(self.rate, self.low, self.high)
+
+
+class Stratum(object):
+
+    def __init__(self):
+        self.seen = 0
+        self.sampled = 0
+        self.failures = {}
+
+    def add(self, failures):
+        self.sampled += 1
+        for rule, value in failures:
+            key = (rule.kind, rule.key)
+            self.failures[key] = self.failures.get(key, 0) + 1
+
+
+class SamplingReport(object):
+
+    def __init__(self, metamodel, strata, z, stopped_early):
+        self.strata = strata
+        self.stopped_early = stopped_early
+        self.seen = sum(each.seen for each in strata.values())
+        self.sampled = sum(each.sampled for each in strata.values())
+        self.fields = {
+            each.key: self.estimate((each.kind, each.key), z)
+            for each in metamodel.fields.values()
+        }
+        self.constraints = {
+            each.key: self.estimate((each.kind, each.key), z)
+            for each in metamodel.constraints
+        }
+
+    def estimate(self, key, z):
+        strata = [each for each in self.strata.values() if each.sampled]
+        seen = sum(each.seen for each in strata)
+        rate, variance, failures = 0.0, 0.0, 0
+        for each in strata:
+            weight = float(each.seen) / seen
+            count = each.failures.get(key, 0)
+            p = float(count) / each.sampled
+            rate += weight * p
+            variance += weight * weight * p * (1.0 - p) / each.sampled
+            failures += count
+        # Effective sample size, which is the plain sample size if unstratified
+        n = rate * (1.0 - rate) / variance if variance else self.sampled
+        low, high = wilson_interval(rate, n, z)
+        return Estimate(rate, low, high, failures, self.sampled)
+
+    @property
+    def precision(self):
+        estimates = self.fields.values() + self.constraints.values()
+        return max([each.half_width for each in estimates] or [0.0])
+
+    def __repr__(self):
+        return "<SamplingReport sampled={} seen={} precision={:.4f}>".format(
+            self.sampled, self.seen, self.precision)
+
+
+class SamplingValidator(object):
+
+    def __init__(self, model, confidence=0.95, precision=None, max_samples=None,
+                 fraction=1.0, stratify_by=None, per_stratum=None, check_every=100, seed=None):
+        self.model = model
+        self.metamodel = model.metamodel
+        self.z = z_score(confidence)
+        self.precision = precision
+        self.max_samples = max_samples
+        self.fraction = fraction
+        self.stratify_by = stratify_by
+        if stratify_by is not None and stratify_by not in self.metamodel.fields:
+            raise ValueError, "expected field of {}, got {}".format(self.metamodel.name, stratify_by)
+        self.per_stratum = per_stratum
+        self.check_every = check_every
+        self.random = random.Random(seed)
+
+    def stratum_of(self, record):
+        if self.stratify_by is None: return None
+        data = record.data if isinstance(record, Model) else record
+        return self.metamodel.fields[self.stratify_by].value_in(data)
+
+    def as_entity(self, record):
+        return record if isinstance(record, Model) else self.model(**record)
+
+    def ordered(self, records):
+        if hasattr(records, '__len__') and hasattr(records, '__getitem__'):
+            return random_order(records, self.random)
+        return iter(records)
+
+    def run(self, records):
+        strata = {}
+        sampled = 0
+        for record in self.ordered(records):
+            key = self.stratum_of(record)
+            stratum = strata.get(key) or strata.setdefault(key, Stratum())
+            stratum.seen += 1
+            if self.per_stratum is not None and stratum.sampled >= self.per_stratum: continue
+            if self.fraction < 1.0 and self.random.random() >= self.fraction: continue
+            entity = self.as_entity(record)
+            stratum.add(self.metamodel.failures(entity))
+            sampled += 1
+            if self.max_samples is not None and sampled >= self.max_samples: break
+            if self.precision is not None and sampled % self.check_every == 0:
+                report = SamplingReport(self.metamodel, strata, self.z, stopped_early=True)
+                if report.precision <= self.precision: return report
+        return SamplingReport(self.metamodel, strata, self.z, stopped_early=False)
+
+
+def estimate_error_rates(model, records, **options):
+    return SamplingValidator(model, **options).run(records)
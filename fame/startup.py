@@ -0,0 +1,29 @@
+from model import Metamodel
+from model import Model
+
+
+# Finalizes metamodels upfront rather than on first access.
+#
+# - warm_up finalizes all model classes, or the given ones, in one place
+# - Call it once at startup, after importing all model modules
+#
+# There is no on-disk snapshot of finalized metamodels. Finalizing runs the
+# metamodel function, which declares fields, and restoring fields from disk
+# costs at least as much as declaring them, see benchmarks/bench__startup.py
+#
+# Example
+#
+#     import myapp.models
+#     warm_up()
+
+
+def all_models(root=Model):
+    for each in root.__subclasses__():
+        if isinstance(each.__dict__.get('metamodel'), Metamodel): yield each
+        for model in all_models(each): yield model
+
+
+def warm_up(models=None):
+    models = list(all_models()) if models is None else list(models)
+    for each in models: each.metamodel
+    return models
@@ -0,0 +1,77 @@
+import pickle
+
+from expects import *
+
+from fame import constraint
+from fame import options
+from fame import schema
+from fame import Model
+from fame.aggregate import ErrorAggregate
+
+
+class Example(Model):
+
+    @schema
+    def metamodel(self, m):
+        m.field('name', str)
+        m.field('subject', options('user', 'visitor'))
+        m.field('percent_exposed', int, default=100)
+
+    @constraint("expected percent_exposed to not exceed 100, got {}")
+    def constraint(self):
+        if self.percent_exposed > 100:
+            return self.percent_exposed
+
+
+def examples(count, offset=0):
+    for n in xrange(offset, offset + count):
+        yield Example(name='e{}'.format(n), subject='email', percent_exposed=n)
+
+
+def test____should_count_failures_per_field_and_constraint():
+    aggregate = ErrorAggregate(Example).consume(examples(200))
+
+    expect(aggregate.entities).to(equal(200))
+    expect(aggregate.invalid_entities).to(equal(200))
+    expect(aggregate.fields['subject'].count).to(equal(200))
+    expect(aggregate.constraints["expected percent_exposed to not exceed 100, got {}"].count).to(equal(99))
+    expect(aggregate.fields).to_not(have_key('name'))
+
+
+def test____should_keep_bounded_samples():
+    aggregate = ErrorAggregate(Example, sample_size=3, seed=42).consume(examples(1000))
+    samples = aggregate.fields['subject'].samples
+
+    expect(samples).to(have_length(3))
+    expect(samples[0][0]).to(start_with('e'))
+    expect(samples[0][1]).to(equal('email'))
+
+
+def test____should_sort_most_common():
+    aggregate = ErrorAggregate(Example).consume(examples(200))
+    rows = aggregate.most_common()
+
+    expect([kind for kind, key, stats in rows]).to(equal(['field', 'constraint']))
+    expect(aggregate.most_common(1)).to(have_length(1))
+
+
+def test____should_merge_partial_aggregates():
+    first = ErrorAggregate(Example, sample_size=4, seed=1).consume(examples(100))
+    second = ErrorAggregate(Example, sample_size=4, seed=2).consume(examples(100, offset=100))
+    second = pickle.loads(pickle.dumps(second))
+    merged = first.merge(second)
+
+    expect(merged.entities).to(equal(200))
+    expect(merged.fields['subject'].count).to(equal(200))
+    expect(merged.fields['subject'].samples).to(have_length(4))
+    expect(merged.constraints["expected percent_exposed to not exceed 100, got {}"].count).to(equal(99))
+
+
+def test____should_not_merge_other_models():
+    class Other(Model):
+
+        @schema
+        def metamodel(self, m):
+            pass
+
+    expect(lambda: ErrorAggregate(Example).merge(ErrorAggregate(Other))).to(raise_error(ValueError))
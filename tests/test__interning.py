@@ -0,0 +1,124 @@
+from expects import *
+
+from fame import array
+from fame import nullable
+from fame import options
+from fame import regexp
+from fame import schema
+from fame import Model
+from fame.interning import InternTable
+
+
+TABLE = InternTable(max_size=10)
+
+
+class Example(Model):
+
+    @schema
+    def metamodel(self, m):
+        m.intern_values(TABLE, share_arrays=True)
+        m.field('name', str)
+        m.field('subject', options('user', 'visitor'))
+        m.field('treatments', array(str))
+        m.field('design', nullable(regexp("^https?://")))
+
+
+class Plain(Model):
+
+    @schema
+    def metamodel(self, m):
+        m.field('subject', options('user', 'visitor'))
+        m.field('treatments', array(str))
+
+
+def fresh(string):
+    # Builds a copy of string that is not identical to the literal
+    return ''.join(list(string))
+
+
+def test____should_intern_options_to_declared_options():
+    m = Example(subject=fresh('user'))
+
+    expect(m.data['subject']).to(be(Example.options_for('subject')[0]))
+
+
+def test____should_intern_regexp_values():
+    m1 = Example(design=fresh('http://example.com'))
+    m2 = Example(design=fresh('http://example.com'))
+
+    expect(m1.data['design']).to(be(m2.data['design']))
+
+
+def test____should_not_intern_plain_strings():
+    m1 = Example(name=fresh('button_color'))
+    m2 = Example(name=fresh('button_color'))
+
+    expect(m1.data['name']).to_not(be(m2.data['name']))
+
+
+def test____should_share_arrays():
+    m1 = Example(treatments=[fresh('control'), fresh('treatment')])
+    m2 = Example(treatments=[fresh('control'), fresh('treatment')])
+
+    expect(m1.treatments).to(be(m2.treatments))
+    expect(m1.treatments).to(equal(('control', 'treatment')))
+    expect(m1.is_valid(fields=['treatments'])).to(be_true)
+
+
+def test____should_not_intern_without_opt_in():
+    treatments = ['control']
+    m = Plain(subject=fresh('user'), treatments=treatments)
+
+    expect(m.data['subject']).to_not(be(Plain.options_for('subject')[0]))
+    expect(m.treatments).to(be(treatments))
+
+
+def test____should_bound_intern_table():
+    table = InternTable(max_size=2)
+    values = [table.intern(fresh(each)) for each in 'one two three three'.split()]
+
+    expect(len(table)).to(equal(2))
+    expect(values[2]).to_not(be(values[3]))
+    expect(table.stats()).to(equal(dict(size=2, max_size=2, hits=0, misses=2, rejected=2)))
+
+
+def test____should_create_model_without_schema():
+    class Schemaless(Model):
+        pass
+
+    expect(Schemaless(name='button_color').data).to(equal(dict(name='button_color')))
+
+
+def test____should_cache_regexp_only_when_interning():
+    Example(design='http://example.com').validate(fields=['design'])
+
+    expect(Example.metamodel.fields['design'].match.match.cache).to(have_key('http://example.com'))
+    expect(regexp("^https?://").cache).to(be_none)
+
+
+def test____should_clear_full_regexp_cache():
+    match = regexp("^https?://")
+    match.enable_cache()
+    match.cache_size = 2
+    for each in ['http://a.com', 'http://b.com', 'http://c.com']: match(each)
+
+    expect(match.cache).to(equal({'http://c.com': True}))
+
+
+def test____should_keep_type_of_interned_values():
+    table = InternTable()
+    first = table.intern(fresh('http://example.com'))
+    second = table.intern(u'http://example.com')
+
+    expect(first).to(be_a(str))
+    expect(second).to(be_a(unicode))
+    expect(Example(subject=u'user').data['subject']).to(be_a(unicode))
+
+
+def test____should_keep_type_of_shared_array_elements():
+    m1 = Example(treatments=['control'])
+    m2 = Example(treatments=[u'control'])
+
+    expect(m1.treatments[0]).to(be_a(str))
+    expect(m2.treatments[0]).to(be_a(unicode))
+    expect(m1.treatments).to_not(be(m2.treatments))
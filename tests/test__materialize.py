@@ -0,0 +1,129 @@
+from multiprocessing.pool import ThreadPool
+
+from expects import *
+
+from fame import derived_field
+from fame import schema
+from fame import Model
+from fame.materialize import dependency_order
+from fame.materialize import materialize
+from fame.materialize import MaterializationError
+from fame.materialize import MissingDependency
+
+
+class Example(Model):
+
+    @schema
+    def metamodel(self, m):
+        m.field('name', str)
+        m.field('percent_exposed', int, default=100)
+
+    @derived_field
+    def title(self):
+        return self.name.title()
+
+    @derived_field
+    def headline(self):
+        return "{} at {}%".format(self.title, self.percent_exposed)
+
+    @derived_field
+    def ratio(self):
+        return 100 / self.percent_exposed
+
+    @derived_field
+    def inverse(self):
+        return 1.0 / self.ratio
+
+
+class Unpicklable(Exception):
+
+    def __init__(self, a, b):
+        Exception.__init__(self, a)
+
+
+class Fragile(Model):
+
+    @schema
+    def metamodel(self, m):
+        m.field('name', str)
+
+    @derived_field
+    def title(self):
+        raise Unpicklable('expected to fail', 'twice')
+
+    @derived_field
+    def label(self):
+        return self.name.title()
+
+
+def examples():
+    return [
+        Example(name='button color', percent_exposed=50),
+        Example(name='font size', percent_exposed=0),
+    ]
+
+
+def test____should_order_dependencies():
+    expect(dependency_order(Example.metamodel, ['headline'])).to(equal(['title', 'headline']))
+    expect(dependency_order(Example.metamodel, ['inverse', 'ratio'])).to(equal(['ratio', 'inverse']))
+    expect(lambda: dependency_order(Example.metamodel, ['covfefe'])).to(raise_error(ValueError))
+
+
+def test____should_materialize_derived_fields():
+    entities = examples()
+    report = materialize(entities, ['headline', 'inverse'], workers=2)
+
+    expect(entities[0].data['headline']).to(equal('Button Color at 50%'))
+    expect(entities[0].__dict__['inverse']).to(equal(0.5))
+    expect(entities[1].data['headline']).to(equal('Font Size at 0%'))
+    expect(report.entities).to(equal(2))
+    expect(report.computed).to(equal(6))
+
+
+def test____should_report_failures_per_entity():
+    entities = examples()
+    report = materialize(entities, ['inverse', 'title'])
+
+    expect(report.failures).to(have_keys(1))
+    expect(report.failures[1]['ratio']).to(be_a(ZeroDivisionError))
+    expect(report.failures[1]['inverse']).to(be_a(MissingDependency))
+    expect(entities[1].data['title']).to(equal('Font Size'))
+    expect(entities[1].data).to_not(have_key('inverse'))
+
+
+def test____should_materialize_on_given_pool():
+    entities = examples()
+    pool = ThreadPool(1)
+    materialize(entities, ['title'], pool=pool)
+    pool.close()
+
+    expect(entities[0].title).to(equal('Button Color'))
+
+
+def test____should_materialize_on_process_pool():
+    entities = examples()
+    report = materialize(entities, ['headline'], workers=2, processes=True)
+
+    expect(entities[0].data['headline']).to(equal('Button Color at 50%'))
+    expect(entities[1].headline).to(equal('Font Size at 0%'))
+    expect(report.computed).to(equal(4))
+
+
+def test____should_report_unpicklable_errors_from_process_pool():
+    entities = [Fragile(name='button color'), Fragile(name='font size')]
+    report = materialize(entities, ['title', 'label'], workers=2, processes=True)
+
+    expect(report.failures).to(have_keys(0, 1))
+    expect(report.failures[0]['title']).to(be_a(MaterializationError))
+    expect(str(report.failures[0]['title'])).to(equal('Unpicklable: expected to fail'))
+    expect(report.failures[0]['title'].traceback).to(contain('Traceback'))
+
+
+def test____should_not_depend_on_attributes_of_other_objects():
+    entities = [Fragile(name='button color')]
+    report = materialize(entities, ['title', 'label'])
+
+    expect(dependency_order(Fragile.metamodel, ['label'])).to(equal(['label']))
+    expect(report.failures[0]).to(have_keys('title'))
+    expect(report.failures[0]).to_not(have_key('label'))
+    expect(entities[0].data['label']).to(equal('Button Color'))
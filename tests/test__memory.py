@@ -0,0 +1,69 @@
+from expects import *
+
+from fame import derived_field
+from fame import options
+from fame import schema
+from fame import Model
+from fame.memory import live_entities
+from fame.memory import measure
+
+
+class Example(Model):
+
+    @schema
+    def metamodel(self, m):
+        m.field('name', str)
+        m.field('subject', options('user', 'visitor'))
+        m.field('percent_exposed', int, default=100)
+
+    @derived_field
+    def title(self):
+        return self.name.title()
+
+
+def examples(count):
+    return [Example(name='button color {}'.format(n), subject='user', whatnot=[n]) for n in xrange(count)]
+
+
+def test____should_break_down_bytes_per_category():
+    entities = examples(10)
+    for each in entities: each.title
+    footprint = measure(entities).models['Example']
+
+    expect(footprint.entities).to(equal(10))
+    expect(footprint.categories['fields']).to(be_above(0))
+    expect(footprint.categories['derived']).to(be_above(0))
+    expect(footprint.categories['custom']).to(be_above(0))
+    expect(footprint.categories['overhead']).to(be_above(0))
+    expect(footprint.total).to(equal(sum(footprint.categories.values())))
+    expect(footprint.attributes).to(have_keys('name', 'subject', 'title', 'whatnot'))
+
+
+def test____should_not_count_memoized_attributes_twice():
+    entities = examples(10)
+    before = measure(entities).models['Example'].categories['fields']
+    for each in entities: each.name
+    after = measure(entities).models['Example'].categories['fields']
+
+    expect(after).to(equal(before))
+
+
+def test____should_count_shared_values_once():
+    entities = examples(10)
+    shared = measure(entities).models['Example'].attributes['subject']
+    once = measure(entities, count_shared=False).models['Example'].attributes['subject']
+
+    expect(once * 10).to(equal(shared))
+
+
+def test____should_sample_entities():
+    report = measure(examples(100), sample_size=10, seed=1)
+
+    expect(report.models['Example'].entities).to(equal(10))
+    expect(str(report)).to(contain('Example'))
+
+
+def test____should_find_live_entities():
+    entities = examples(3)
+
+    expect(list(live_entities(Example))).to(contain(*entities))
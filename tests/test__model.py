@@ -209,3 +209,62 @@ def test____should_have_metamodel():
     expect(Example).to(have_property('metamodel'))
     expect(Example.metamodel).to(equal(m.metamodel))
 
+
+def test____should_count_errors():
+    m = Example(name='button_color', percent_exposed=200, design=False)
+
+    expect(m.validate('count')).to(equal(4))
+    expect(m.validate('count', limit=2)).to(equal(2))
+
+
+def test____should_fail_fast():
+    m = Example(name='button_color', percent_exposed=200, design=False)
+
+    expect(m.validate('valid')).to(be_false)
+    expect(m.is_valid(fields=['name'], constraints=[])).to(be_true)
+
+
+def test____should_return_top_n_error_messages():
+    m = Example(name='button_color', percent_exposed=200, design=False)
+    errors = m.validate('messages', limit=3)
+
+    expect(errors).to(have_length(3))
+    expect(list(m.error_messages())[:3]).to(equal(errors))
+
+
+def test____should_validate_subset_of_fields_and_constraints():
+    m = Example(name='button_color', percent_exposed=200, design=False)
+
+    expect(m.validate(fields=['design'], constraints=[])).to(equal([
+        "Example 'button_color' expected field 'design' to be nullable(regexp(^https?://)), got False"
+    ]))
+    expect(m.validate(fields=[], constraints=["expected percent_exposed to not exceed 100, got {}"])).to(equal([
+        "Example 'button_color' expected percent_exposed to not exceed 100, got 200"
+    ]))
+
+
+def test____should_return_failures():
+    m = Example(name='button_color', subject='user', treatments=[], percent_exposed=200)
+    failures = m.validate('failures')
+
+    expect(failures).to(have_length(1))
+    expect(failures[0][0]).to(be(m.metamodel.constraints[0]))
+    expect(failures[0][1]).to(equal((200,)))
+
+
+def test____should_not_validate_unknown_mode():
+    m = Example()
+
+    expect(lambda: m.validate('covfefe')).to(raise_error(ValueError))
+
+
+def test____should_not_validate_unknown_field():
+    m = Example()
+
+    expect(lambda: m.validate('count', fields=['covfefe'])).to(raise_error(ValueError, contain('covfefe')))
+
+
+def test____should_not_validate_unknown_constraint():
+    m = Example()
+
+    expect(lambda: m.validate('count', constraints=['no such message'])).to(raise_error(ValueError, contain('no such message')))
@@ -0,0 +1,120 @@
+import random
+
+from expects import *
+
+from fame import constraint
+from fame import options
+from fame import schema
+from fame import Model
+from fame.sampling import estimate_error_rates
+from fame.sampling import random_order
+from fame.sampling import wilson_interval
+from fame.sampling import z_score
+
+
+class Example(Model):
+
+    @schema
+    def metamodel(self, m):
+        m.field('name', str)
+        m.field('subject', options('user', 'visitor', 'email'))
+        m.field('percent_exposed', int, default=100)
+
+    @constraint("expected percent_exposed to not exceed 100, got {}")
+    def constraint(self):
+        if self.percent_exposed > 100:
+            return self.percent_exposed
+
+
+def records(count):
+    # Every tenth record has a missing name, all email records exceed 100
+    subjects = ['user'] * 8 + ['visitor', 'email']
+    return [
+        dict(
+            name=None if n % 10 == 0 else 'e{}'.format(n),
+            subject=subjects[n % 10],
+            percent_exposed=200 if subjects[n % 10] == 'email' else 50,
+        )
+        for n in xrange(count)
+    ]
+
+
+def test____should_compute_z_score():
+    expect(z_score(0.95)).to(be_within(1.959, 1.960))
+
+
+def test____should_compute_wilson_interval():
+    low, high = wilson_interval(0.0, 100, 1.96)
+
+    expect(low).to(equal(0.0))
+    expect(high).to(be_within(0.036, 0.038))
+
+
+def test____should_estimate_error_rates_of_all_records():
+    report = estimate_error_rates(Example, records(1000), seed=1)
+
+    expect(report.sampled).to(equal(1000))
+    expect(report.stopped_early).to(be_false)
+    expect(report.fields['name'].rate).to(equal(0.1))
+    expect(report.fields['subject'].rate).to(equal(0.0))
+    expect(report.constraints["expected percent_exposed to not exceed 100, got {}"].rate).to(equal(0.1))
+    expect(report.fields['name'].low).to(be_below(0.1))
+    expect(report.fields['name'].high).to(be_above(0.1))
+
+
+def test____should_stop_early_at_precision():
+    report = estimate_error_rates(Example, records(10000), precision=0.05, check_every=50, seed=1)
+
+    expect(report.stopped_early).to(be_true)
+    expect(report.sampled).to(be_below(1000))
+    expect(report.precision).to(be_below_or_equal(0.05))
+
+
+def test____should_sample_iterables():
+    report = estimate_error_rates(Example, iter(records(1000)), fraction=0.5, seed=1)
+
+    expect(report.seen).to(equal(1000))
+    expect(report.sampled).to(be_within(400, 600))
+
+
+def test____should_stratify_by_options_field():
+    report = estimate_error_rates(Example, records(1000), stratify_by='subject', per_stratum=20, seed=1)
+
+    expect(report.seen).to(equal(1000))
+    expect(report.sampled).to(equal(60))
+    expect(report.strata['email'].seen).to(equal(100))
+    expect(report.constraints["expected percent_exposed to not exceed 100, got {}"].rate).to(be_within(0.099, 0.101))
+
+
+def test____should_sample_entities():
+    entities = [Example(**each) for each in records(100)]
+    report = estimate_error_rates(Example, entities, max_samples=10, seed=1)
+
+    expect(report.sampled).to(equal(10))
+
+
+def test____should_visit_all_records_once_in_random_order():
+    order = random_order(range(1000), random.Random(1))
+    visited = list(order)
+
+    expect(sorted(visited)).to(equal(range(1000)))
+    expect(visited).to_not(equal(range(1000)))
+    expect(order.gi_frame).to(be_none)
+
+
+def test____should_forget_visited_indices():
+    order = random_order(range(1000), random.Random(1))
+    for each in xrange(999): next(order)
+
+    expect(len(order.gi_frame.f_locals['swapped'])).to(be_below_or_equal(1))
+
+
+def test____should_stratify_records_by_default_value():
+    records = [dict(name='e1', percent_exposed=None), Example(name='e2')]
+    report = estimate_error_rates(Example, records, stratify_by='percent_exposed', seed=1)
+
+    expect(report.strata.keys()).to(equal([100]))
+
+
+def test____should_not_stratify_by_unknown_field():
+    expect(lambda: estimate_error_rates(Example, [], stratify_by='covfefe')).to(raise_error(ValueError, contain('covfefe')))
@@ -0,0 +1,42 @@
+from expects import *
+
+from fame import options
+from fame import regexp
+from fame import schema
+from fame import Model
+from fame.startup import all_models
+from fame.startup import warm_up
+
+
+def define_example():
+
+    class Example(Model):
+
+        @schema
+        def metamodel(self, m):
+            m.field('name', str)
+            m.field('subject', options('user', 'visitor'))
+            m.field('design', regexp("^https?://"))
+
+    return Example
+
+
+def test____should_warm_up_models():
+    Example = define_example()
+
+    expect(Example.__dict__['metamodel'].pending_initialization).to_not(be_none)
+    expect(warm_up([Example])).to(equal([Example]))
+    expect(Example.__dict__['metamodel'].pending_initialization).to(be_none)
+
+
+def test____should_find_all_models():
+    Example = define_example()
+
+    expect(list(all_models())).to(contain(Example))
+
+
+def test____should_warm_up_all_models():
+    Example = define_example()
+    warm_up()
+
+    expect(Example.__dict__['metamodel'].pending_initialization).to(be_none)